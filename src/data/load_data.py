@@ -2,12 +2,19 @@ from __future__ import annotations
 
 import json
 from io import BytesIO
-from typing import Tuple
+from typing import Iterator, Optional, Tuple
 
 import boto3
+import numpy as np
 import pandas as pd
 import pyarrow as pa
 import pyarrow.parquet as pq
+from pyarrow import fs
+
+from src.data.sampling import count_strata, most_common_values, stratified_sample_batches, stratum_sizes
+
+# Raw columns the sampling strata are derived from
+STRATA_SOURCE_COLUMNS = ['job_title', 'job_description', 'date_posted']
 
 
 def load_data_from_s3(file_key: str, bucket_name: str) -> pd.DataFrame:
@@ -18,6 +25,15 @@ def load_data_from_s3(file_key: str, bucket_name: str) -> pd.DataFrame:
     return pq.read_table(parquet_file).to_pandas()
 
 
+def iter_data_from_s3(file_key: str, bucket_name: str, batch_size: int = 65536,
+                      columns: Optional[list[str]] = None) -> Iterator[pd.DataFrame]:
+    """Stream a Parquet file from S3 as pandas DataFrames of at most ``batch_size`` rows."""
+    s3 = fs.S3FileSystem()
+    with s3.open_input_file(f"{bucket_name}/{file_key}") as f:
+        for batch in pq.ParquetFile(f).iter_batches(batch_size=batch_size, columns=columns):
+            yield batch.to_pandas()
+
+
 def clean_data(df: pd.DataFrame) -> pd.DataFrame:
     """Clean the LinkedIn job listings dataset."""
     # Handle missing values
@@ -36,6 +52,32 @@ def clean_data(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def get_job_level(titles: pd.Series) -> pd.Series:
+    """Derive the job level from job titles."""
+    senior = titles.str.contains(r'Senior|Sr\.', na=False)
+    junior = titles.str.contains(r'Junior|Jr\.', na=False)
+    levels = np.select([titles.isna(), senior, junior], ['Unknown', 'Senior', 'Junior'], 'Mid-level')
+    return pd.Series(levels, index=titles.index, dtype=object)
+
+
+def get_industry(descriptions: pd.Series) -> pd.Series:
+    """Derive the industry from the text after the last ' in ' of job descriptions."""
+    has_industry = descriptions.str.contains(' in ', regex=False, na=False)
+    industry = descriptions.str.rsplit(' in ', n=1).str[-1].str.split('.', n=1).str[0]
+    return industry.where(has_industry, 'Unknown').astype(object)
+
+
+def add_strata(df: pd.DataFrame) -> pd.DataFrame:
+    """Add the ``industry``, ``job_level`` and ``posting_month`` sampling strata to raw rows.
+
+    The values match what ``clean_data`` followed by ``engineer_features`` produce, without
+    paying for the rest of the cleaning and feature engineering.
+    """
+    return df.assign(industry=get_industry(df['job_description']),
+                     job_level=get_job_level(df['job_title'].fillna('Unknown')),
+                     posting_month=pd.to_datetime(df['date_posted'], errors='coerce').dt.month)
+
+
 def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
     """Engineer features for the hiring trend analysis."""
     # Extract year and month from date_posted
@@ -44,39 +86,19 @@ def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
     df['posting_month'] = df['date_posted'].dt.month
 
     # Create a job level feature
-    def get_job_level(title):
-        if pd.isna(title):
-            return 'Unknown'
-        elif 'Senior' in title or 'Sr.' in title:
-            return 'Senior'
-        elif 'Junior' in title or 'Jr.' in title:
-            return 'Junior'
-        else:
-            return 'Mid-level'
-
-    df['job_level'] = df['job_title'].apply(get_job_level)
+    df['job_level'] = get_job_level(df['job_title'])
 
     # Create a skill count feature
     df['skill_count'] = df['job_skills'].fillna('').str.count(',') + 1
 
     # Create an industry feature (this is a simplification, you might want to use a more sophisticated method)
-    df['industry'] = df['job_description'].apply(
-        lambda x: x.split(' in ')[-1].split('.')[0] if pd.notna(x) and ' in ' in x else 'Unknown')
+    df['industry'] = get_industry(df['job_description'])
 
     return df
 
 
-def prepare_data(config: dict) -> Tuple[pd.DataFrame, pd.Series, list[str]]:
-    """Prepare the dataset for machine learning."""
-    # Load data from S3
-    df = load_data_from_s3(config['s3_key_name'], config['s3_bucket_name'])
-
-    # Clean the data
-    df = clean_data(df)
-
-    # Engineer features
-    df = engineer_features(df)
-
+def select_features(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series, list[str]]:
+    """Split an engineered DataFrame into model features and the salary target."""
     # Select features for the model
     features = ['job_title', 'company_name', 'job_location', 'job_skills', 'posting_year',
                 'posting_month', 'job_level', 'skill_count', 'industry']
@@ -91,6 +113,54 @@ def prepare_data(config: dict) -> Tuple[pd.DataFrame, pd.Series, list[str]]:
     return X, y, available_features
 
 
+def load_sampled_data(config: dict, fraction: float) -> pd.DataFrame:
+    """Stream a stratified sample of the dataset from S3 and return it cleaned and feature-engineered.
+
+    The file is streamed twice: once reading only the columns the strata are derived from,
+    to count rows per stratum, and once to keep the lowest-hash rows of each stratum.
+    Industries outside the ``sample_max_industries`` most common ones share one stratum.
+    Only the sampled rows are cleaned and feature-engineered.
+    """
+    if not 0 < fraction <= 1:
+        raise ValueError(f"Sample fraction must be in (0, 1], got {fraction}")
+
+    file_key, bucket_name = config['s3_key_name'], config['s3_bucket_name']
+    batch_size = config.get('sample_batch_size', 65536)
+
+    counts = count_strata(add_strata(batch) for batch in
+                          iter_data_from_s3(file_key, bucket_name, batch_size, columns=STRATA_SOURCE_COLUMNS))
+    if counts.empty:
+        raise ValueError(f"No rows to sample in s3://{bucket_name}/{file_key}")
+    common_values = {'industry': most_common_values(counts, 'industry', config.get('sample_max_industries', 50))}
+    batches = (add_strata(batch) for batch in iter_data_from_s3(file_key, bucket_name, batch_size))
+    df = stratified_sample_batches(batches, fraction, stratum_sizes(counts, common_values),
+                                   seed=config.get('sample_seed', 42), common_values=common_values)
+    if df.empty:
+        raise ValueError(f"No rows left after sampling {fraction:.0%} of s3://{bucket_name}/{file_key}")
+
+    # Cleaning the combined sample also drops duplicates that arrived in different batches
+    return engineer_features(clean_data(df.copy()))
+
+
+def prepare_sampled_data(config: dict, fraction: float) -> Tuple[pd.DataFrame, pd.Series, list[str]]:
+    """Prepare a stratified sample of the dataset, streaming it from S3 batch by batch."""
+    return select_features(load_sampled_data(config, fraction))
+
+
+def prepare_data(config: dict) -> Tuple[pd.DataFrame, pd.Series, list[str]]:
+    """Prepare the dataset for machine learning."""
+    # Load data from S3
+    df = load_data_from_s3(config['s3_key_name'], config['s3_bucket_name'])
+
+    # Clean the data
+    df = clean_data(df)
+
+    # Engineer features
+    df = engineer_features(df)
+
+    return select_features(df)
+
+
 if __name__ == "__main__":
     # Load configuration
     with open('config.json', 'r') as f:
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+STRATA_COLUMNS = ['industry', 'job_level', 'posting_month']
+SAMPLE_KEY_COLUMNS = ['job_title', 'company_name', 'job_location', 'job_skills', 'date_posted']
+OTHER_STRATUM_VALUE = 'Other'
+
+# Bookkeeping columns carried by sampled rows so smaller samples can be sliced from them
+HASH_COLUMN = '_sample_hash'
+STRATUM_COLUMN = '_stratum'
+STRATUM_SIZE_COLUMN = '_stratum_size'
+
+
+def _hash_key(seed: int) -> str:
+    """Turn an integer seed into the 16-character key pandas hashing expects."""
+    return str(seed).zfill(16)[-16:]
+
+
+def sample_hash(df: pd.DataFrame, seed: int = 42, key_columns: Optional[list[str]] = None) -> pd.Series:
+    """Map each row to a deterministic value in [0, 1) derived from its content."""
+    key_columns = [c for c in (key_columns or SAMPLE_KEY_COLUMNS) if c in df.columns]
+    if not key_columns:
+        raise ValueError("None of the sample key columns are present in the DataFrame")
+
+    keys = df[key_columns].copy()
+    if 'date_posted' in keys.columns:
+        # Hash raw date strings and parsed timestamps alike
+        keys['date_posted'] = pd.to_datetime(keys['date_posted'], errors='coerce')
+    hashed = pd.util.hash_pandas_object(keys, index=False, hash_key=_hash_key(seed))
+    # Keep the top 53 bits so the division into [0, 1) is exact in float64
+    return pd.Series((hashed.values >> np.uint64(11)) / float(2 ** 53), index=df.index)
+
+
+def stratum_labels(df: pd.DataFrame, strata: Optional[list[str]] = None,
+                   common_values: Optional[dict[str, set]] = None) -> pd.Series:
+    """Label each row with its stratum.
+
+    Values of a column listed in ``common_values`` that are not among its common values
+    are folded into a single ``Other`` value, which keeps free-text columns such as
+    ``industry`` from producing a stratum per row.
+    """
+    labels = None
+    for column in strata or STRATA_COLUMNS:
+        values = df[column].astype(str)
+        if common_values and column in common_values:
+            values = values.where(values.isin(common_values[column]), OTHER_STRATUM_VALUE)
+        labels = values if labels is None else labels + '|' + values
+    return labels
+
+
+def count_strata(batches: Iterable[pd.DataFrame], strata: Optional[list[str]] = None) -> pd.Series:
+    """Count rows per combination of ``strata`` values across a stream of DataFrames."""
+    strata = strata or STRATA_COLUMNS
+    counts = pd.Series(dtype='int64')
+    for batch in batches:
+        batch_counts = batch[strata].astype(str).value_counts()
+        counts = batch_counts if counts.empty else counts.add(batch_counts, fill_value=0)
+    return counts.astype('int64')
+
+
+def most_common_values(counts: pd.Series, column: str, limit: int) -> set:
+    """Return the ``limit`` most frequent values of ``column`` in stratum ``counts``."""
+    totals = counts.groupby(level=column).sum()
+    return set(totals.nlargest(limit).index)
+
+
+def stratum_sizes(counts: pd.Series, common_values: Optional[dict[str, set]] = None) -> pd.Series:
+    """Turn ``count_strata`` output into row counts indexed by stratum label."""
+    labels = stratum_labels(counts.index.to_frame(index=False), list(counts.index.names), common_values)
+    return pd.Series(counts.values, index=labels.values).groupby(level=0).sum()
+
+
+def _select(df: pd.DataFrame, fraction: float) -> pd.DataFrame:
+    """Keep the ``max(1, ceil(fraction * stratum size))`` lowest-hash rows of each stratum."""
+    ranks = df[HASH_COLUMN].groupby(df[STRATUM_COLUMN].values).rank(method='first')
+    quota = np.maximum(1, np.ceil(fraction * df[STRATUM_SIZE_COLUMN]))
+    return df[(ranks <= quota).values]
+
+
+def stratified_sample(df: pd.DataFrame, fraction: float, seed: int = 42, strata: Optional[list[str]] = None,
+                      common_values: Optional[dict[str, set]] = None) -> pd.DataFrame:
+    """Draw a reproducible hash-based sample stratified by ``strata``.
+
+    Each stratum contributes its ``ceil(fraction * size)`` lowest-hash rows, and at least
+    one, so every stratum is represented and smaller fractions are subsets of larger ones.
+    Rows carrying the bookkeeping columns of an earlier sample are re-sampled against the
+    stratum sizes of the full data they were drawn from.
+    """
+    if not 0 < fraction <= 1:
+        raise ValueError(f"Sample fraction must be in (0, 1], got {fraction}")
+    if fraction == 1 or df.empty:
+        return df
+    if HASH_COLUMN in df.columns:
+        return _select(df, fraction)
+
+    labels = stratum_labels(df, strata, common_values)
+    sampled = _select(df.assign(**{HASH_COLUMN: sample_hash(df, seed).values,
+                                   STRATUM_COLUMN: labels.values,
+                                   STRATUM_SIZE_COLUMN: labels.map(labels.value_counts()).values}), fraction)
+    return sampled.drop(columns=[HASH_COLUMN, STRATUM_COLUMN, STRATUM_SIZE_COLUMN])
+
+
+def stratified_sample_batches(batches: Iterable[pd.DataFrame], fraction: float, sizes: pd.Series, seed: int = 42,
+                              strata: Optional[list[str]] = None,
+                              common_values: Optional[dict[str, set]] = None) -> pd.DataFrame:
+    """Stratified-sample a stream of DataFrames without holding the full stream in memory.
+
+    ``sizes`` gives the row count of every stratum in the stream, as returned by
+    ``stratum_sizes``. Only the lowest-hash rows of each stratum seen so far are kept
+    between batches, so memory grows with the sample rather than the stream. Duplicate
+    rows are dropped as they arrive. The result carries the bookkeeping columns, so
+    ``stratified_sample`` can slice smaller fractions from it.
+    """
+    if not 0 < fraction <= 1:
+        raise ValueError(f"Sample fraction must be in (0, 1], got {fraction}")
+
+    sampled = None
+    for batch in batches:
+        if batch.empty:
+            continue
+        labels = stratum_labels(batch, strata, common_values)
+        batch = batch.assign(**{HASH_COLUMN: sample_hash(batch, seed).values,
+                                STRATUM_COLUMN: labels.values,
+                                STRATUM_SIZE_COLUMN: sizes.reindex(labels.values, fill_value=0).values})
+        candidates = batch if sampled is None else pd.concat([sampled, batch], ignore_index=True)
+        candidates = candidates.drop_duplicates(ignore_index=True)
+        sampled = candidates if fraction == 1 else _select(candidates, fraction)
+
+    return pd.DataFrame() if sampled is None else sampled
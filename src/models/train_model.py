@@ -1,11 +1,29 @@
 import json
+import math
 import mlflow
 import mlflow.sklearn
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import mean_squared_error, r2_score
 
-from src.data.load_data import prepare_data
+from src.data.load_data import load_sampled_data, prepare_data, prepare_sampled_data, select_features
+from src.data.sampling import stratified_sample
+
+PROGRESSIVE_FRACTIONS = (0.01, 0.1, 1.0)
+# Smallest sample that leaves at least two test rows for scoring R2
+MIN_SAMPLE_ROWS = 10
+
+
+def _fit_and_evaluate(X, y):
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    model = RandomForestRegressor(n_estimators=100, random_state=42)
+    model.fit(X_train, y_train)
+
+    predictions = model.predict(X_test)
+    mse = mean_squared_error(y_test, predictions)
+    r2 = r2_score(y_test, predictions)
+    return model, mse, r2, len(X_train)
 
 
 def train_model(X, y, config):
@@ -13,14 +31,7 @@ def train_model(X, y, config):
     mlflow.set_experiment("talent_flow_prediction")
 
     with mlflow.start_run():
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-        model = RandomForestRegressor(n_estimators=100, random_state=42)
-        model.fit(X_train, y_train)
-
-        predictions = model.predict(X_test)
-        mse = mean_squared_error(y_test, predictions)
-        r2 = r2_score(y_test, predictions)
+        model, mse, r2, _ = _fit_and_evaluate(X, y)
 
         mlflow.log_param("n_estimators", 100)
         mlflow.log_metric("mse", mse)
@@ -32,10 +43,85 @@ def train_model(X, y, config):
         return mlflow.active_run().info.run_id
 
 
+def train_progressive(config, fractions=PROGRESSIVE_FRACTIONS, min_improvement=0.0):
+    """Train on growing stratified samples, logging a learning curve to MLflow.
+
+    Samples are nested, so the data is streamed once for the largest fraction below 1.0 and
+    the smaller fractions are sliced from it in memory; only a 1.0 fraction loads the full
+    dataset. Each fraction is fitted in a nested run and the parent run records MSE and R2
+    with the number of training rows as the step. Fractions whose sample has fewer than
+    ``MIN_SAMPLE_ROWS`` rows or is no larger than the previous one are skipped and tagged on
+    the parent run. Training stops once R2 improves by less than ``min_improvement`` over the
+    previous fit. Returns the run ID of the last fit.
+    """
+    if not fractions or not all(0 < f <= 1 for f in fractions):
+        raise ValueError(f"Progressive fractions must be in (0, 1], got {list(fractions)}")
+
+    mlflow.set_tracking_uri(config['mlflow_tracking_uri'])
+    mlflow.set_experiment("talent_flow_prediction")
+
+    with mlflow.start_run(run_name="progressive_sampling"):
+        mlflow.log_param("fractions", list(fractions))
+        mlflow.log_param("min_improvement", min_improvement)
+
+        partial_fractions = [f for f in fractions if f < 1]
+        sampled = load_sampled_data(config, max(partial_fractions)) if partial_fractions else None
+
+        run_id = None
+        previous_rows = 0
+        previous_r2 = None
+        for fraction in sorted(fractions):
+            if fraction < 1:
+                X, y, features = select_features(stratified_sample(sampled, fraction))
+            else:
+                X, y, features = prepare_data(config)
+            if len(X) < MIN_SAMPLE_ROWS:
+                mlflow.set_tag(f"skipped_fraction_{fraction}", f"sample has fewer than {MIN_SAMPLE_ROWS} rows")
+                continue
+            if len(X) <= previous_rows:
+                mlflow.set_tag(f"skipped_fraction_{fraction}", "sample did not grow")
+                continue
+
+            with mlflow.start_run(run_name=f"fraction_{fraction}", nested=True) as run:
+                model, mse, r2, train_rows = _fit_and_evaluate(X, y)
+
+                mlflow.log_param("n_estimators", 100)
+                mlflow.log_param("sample_fraction", fraction)
+                mlflow.log_param("sample_rows", len(X))
+                mlflow.log_param("train_rows", train_rows)
+                mlflow.log_metric("mse", mse)
+                mlflow.log_metric("r2", r2)
+
+                mlflow.sklearn.log_model(model, "model")
+                run_id = run.info.run_id
+
+            mlflow.log_metric("mse", mse, step=train_rows)
+            mlflow.log_metric("r2", r2, step=train_rows)
+            previous_rows = len(X)
+
+            # An undefined R2 says nothing about whether more data helps
+            if math.isnan(r2):
+                continue
+            if previous_r2 is not None and r2 - previous_r2 < min_improvement:
+                mlflow.set_tag("stopped_at_fraction", fraction)
+                break
+            previous_r2 = r2
+
+        if run_id is None:
+            raise ValueError(f"No sample had at least {MIN_SAMPLE_ROWS} rows to train on")
+        return run_id
+
+
 if __name__ == "__main__":
     with open('config.json', 'r') as f:
         config = json.load(f)
 
-    X, y, features = prepare_data(config)
-    run_id = train_model(X, y, config)
+    if config.get('progressive_fractions'):
+        run_id = train_progressive(config, config['progressive_fractions'], config.get('min_improvement', 0.0))
+    else:
+        if config.get('sample_fraction'):
+            X, y, features = prepare_sampled_data(config, config['sample_fraction'])
+        else:
+            X, y, features = prepare_data(config)
+        run_id = train_model(X, y, config)
     print(f"Model training completed. Run ID: {run_id}")
@@ -3,7 +3,8 @@ import pytest
 import pandas as pd
 import numpy as np
 from unittest.mock import patch, MagicMock
-from src.data.load_data import clean_data, engineer_features, load_data_from_s3, prepare_data
+from src.data.load_data import add_strata, clean_data, engineer_features, iter_data_from_s3, load_data_from_s3, \
+    load_sampled_data, prepare_data, prepare_sampled_data
 
 
 @pytest.fixture
@@ -106,3 +107,62 @@ def test_prepare_data(mock_engineer, mock_clean, mock_load, sample_df):
     mock_load.assert_called_once()
     mock_clean.assert_called_once()
     mock_engineer.assert_called_once()
+
+
+@patch('src.data.load_data.iter_data_from_s3')
+def test_prepare_sampled_data(mock_iter, sample_df):
+    mock_iter.side_effect = lambda *args, **kwargs: iter([sample_df.iloc[:2].copy(), sample_df.iloc[2:].copy()])
+
+    X, y, features = prepare_sampled_data({'s3_key_name': 'mock_key', 's3_bucket_name': 'mock_bucket',
+                                           'sample_batch_size': 2}, 1.0)
+
+    assert mock_iter.call_args_list[0].args == ('mock_key', 'mock_bucket', 2)
+    assert mock_iter.call_args_list[0].kwargs == {'columns': ['job_title', 'job_description', 'date_posted']}
+    assert mock_iter.call_args_list[1].args == ('mock_key', 'mock_bucket', 2)
+    assert len(X) == len(sample_df)
+    assert y.name == 'salary_value'
+    assert {'industry', 'job_level', 'posting_month'} <= set(features)
+
+
+@patch('src.data.load_data.iter_data_from_s3')
+def test_load_sampled_data_keeps_every_stratum_once(mock_iter, sample_df):
+    # The same rows arriving in two batches must only be sampled once
+    mock_iter.side_effect = lambda *args, **kwargs: iter([sample_df.copy(), sample_df.copy()])
+
+    df = load_sampled_data({'s3_key_name': 'mock_key', 's3_bucket_name': 'mock_bucket'}, 1.0)
+
+    assert len(df) == len(sample_df)
+    assert set(df['industry']) == set(engineer_features(clean_data(sample_df.copy()))['industry'])
+
+
+def test_add_strata_matches_engineered_features(sample_df):
+    strata = add_strata(sample_df.copy())
+    engineered = engineer_features(clean_data(sample_df.copy()))
+
+    for column in ['industry', 'job_level', 'posting_month']:
+        assert list(strata[column]) == list(engineered[column])
+
+
+@patch('src.data.load_data.iter_data_from_s3')
+def test_prepare_sampled_data_raises_on_empty_sample(mock_iter):
+    mock_iter.side_effect = lambda *args, **kwargs: iter([])
+
+    with pytest.raises(ValueError, match='No rows to sample'):
+        prepare_sampled_data({'s3_key_name': 'mock_key', 's3_bucket_name': 'mock_bucket'}, 0.1)
+
+
+@patch('src.data.load_data.pq.ParquetFile')
+@patch('src.data.load_data.fs.S3FileSystem')
+def test_iter_data_from_s3(mock_s3fs, mock_parquet_file):
+    mock_input = mock_s3fs.return_value.open_input_file.return_value.__enter__.return_value
+    batch = MagicMock()
+    batch.to_pandas.return_value = pd.DataFrame({'col1': [1, 2]})
+    mock_parquet_file.return_value.iter_batches.return_value = iter([batch, batch])
+
+    result = list(iter_data_from_s3('mock_key', 'mock_bucket', batch_size=2))
+
+    assert len(result) == 2
+    assert all(isinstance(df, pd.DataFrame) for df in result)
+    mock_s3fs.return_value.open_input_file.assert_called_once_with('mock_bucket/mock_key')
+    mock_parquet_file.assert_called_once_with(mock_input)
+    mock_parquet_file.return_value.iter_batches.assert_called_once_with(batch_size=2, columns=None)
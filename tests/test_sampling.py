@@ -0,0 +1,122 @@
+import math
+
+import pytest
+import pandas as pd
+from src.data.sampling import count_strata, most_common_values, sample_hash, stratified_sample, \
+    stratified_sample_batches, stratum_labels, stratum_sizes
+
+
+@pytest.fixture
+def sample_df():
+    n = 1000
+    return pd.DataFrame({
+        'job_title': [f'Engineer {i}' for i in range(n)],
+        'company_name': [f'Company {i % 37}' for i in range(n)],
+        'job_location': ['New York'] * n,
+        'job_skills': ['Python,SQL'] * n,
+        'date_posted': ['2024-01-01'] * n,
+        'industry': ['tech' if i % 10 else 'finance' for i in range(n)],
+        'job_level': ['Senior' if i % 2 else 'Mid-level' for i in range(n)],
+        'posting_month': [i % 3 + 1 for i in range(n)],
+    })
+
+
+def test_sample_hash_is_deterministic(sample_df):
+    hashes = sample_hash(sample_df)
+    assert hashes.equals(sample_hash(sample_df.copy()))
+    assert hashes.between(0, 1, inclusive='left').all()
+    assert not hashes.equals(sample_hash(sample_df, seed=7))
+
+
+def test_sample_hash_matches_parsed_dates(sample_df):
+    parsed = sample_df.assign(date_posted=pd.to_datetime(sample_df['date_posted']))
+    assert sample_hash(sample_df).equals(sample_hash(parsed))
+
+
+def test_stratified_sample_is_reproducible_and_nested(sample_df):
+    small = stratified_sample(sample_df, 0.05)
+    large = stratified_sample(sample_df, 0.5)
+
+    assert small.equals(stratified_sample(sample_df, 0.05))
+    assert list(small.columns) == list(sample_df.columns)
+    assert set(small.index) <= set(large.index)
+    assert stratified_sample(sample_df, 1.0) is sample_df
+
+
+def test_stratified_sample_takes_fraction_of_each_stratum(sample_df):
+    sampled = stratified_sample(sample_df, 0.05)
+    strata = ['industry', 'job_level', 'posting_month']
+    expected = (sample_df.groupby(strata).size() * 0.05).apply(math.ceil).clip(lower=1)
+    assert sampled.groupby(strata).size().equals(expected)
+
+
+def test_stratified_sample_keeps_rare_strata():
+    n = 20000
+    df = pd.DataFrame({
+        'job_title': [f'Engineer {i}' for i in range(n)],
+        'industry': ['common'] * (n - 600) + [f'rare {i // 20}' for i in range(600)],
+        'job_level': ['Mid-level'] * n,
+        'posting_month': [1] * n,
+    })
+
+    sampled = stratified_sample(df, 0.01)
+
+    assert sampled['industry'].nunique() == 31
+    assert abs(len(sampled) - 0.01 * n) <= 31
+
+
+def test_stratified_sample_folds_uncommon_values():
+    n = 20000
+    df = pd.DataFrame({
+        'job_title': [f'Engineer {i}' for i in range(n)],
+        'industry': [f'industry {i % 5000}' for i in range(n)],
+        'job_level': [i % 4 for i in range(n)],
+        'posting_month': [i % 12 + 1 for i in range(n)],
+    })
+    common = {'industry': {'industry 0', 'industry 1'}}
+
+    sampled = stratified_sample(df, 0.01, common_values=common)
+
+    assert stratum_labels(df, common_values=common).nunique() <= 3 * 4 * 12
+    assert len(sampled) <= 0.01 * n + 3 * 4 * 12
+
+
+def test_stratified_sample_rejects_invalid_fraction(sample_df):
+    with pytest.raises(ValueError):
+        stratified_sample(sample_df, 0)
+    with pytest.raises(ValueError):
+        stratified_sample_batches([sample_df], 1.5, pd.Series(dtype='int64'))
+
+
+def test_stratum_sizes_groups_uncommon_values(sample_df):
+    counts = count_strata([sample_df.iloc[:400], sample_df.iloc[400:]])
+    common = {'industry': most_common_values(counts, 'industry', 1)}
+    sizes = stratum_sizes(counts, common)
+
+    assert common == {'industry': {'tech'}}
+    assert sizes.sum() == len(sample_df)
+    assert sizes['Other|Mid-level|1'] == (sample_df['industry'].eq('finance') & sample_df['posting_month'].eq(1)).sum()
+
+
+def _batches(df, size):
+    return (df.iloc[i:i + size].reset_index(drop=True) for i in range(0, len(df), size))
+
+
+def test_stratified_sample_batches_matches_in_memory_sample(sample_df):
+    sizes = stratum_sizes(count_strata(_batches(sample_df, 128)))
+    streamed = stratified_sample_batches(_batches(sample_df, 128), 0.02, sizes)
+    expected = stratified_sample(sample_df, 0.02)
+
+    assert sorted(streamed['job_title']) == sorted(expected['job_title'])
+    assert sorted(stratified_sample(streamed, 0.01)['job_title']) == \
+        sorted(stratified_sample(sample_df, 0.01)['job_title'])
+
+
+def test_stratified_sample_batches_drops_duplicates_across_batches(sample_df):
+    rows = sample_df.iloc[:200]
+    sizes = stratum_sizes(count_strata([rows, rows]))
+
+    streamed = stratified_sample_batches([rows, rows], 0.5, sizes)
+
+    assert not streamed.duplicated().any()
+    assert len(streamed) <= len(rows)
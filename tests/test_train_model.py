@@ -1,7 +1,9 @@
 import pandas as pd
 import pytest
 from unittest.mock import patch, MagicMock
-from src.models.train_model import train_model
+from src.data.load_data import select_features
+from src.data.sampling import count_strata, stratified_sample_batches, stratum_sizes
+from src.models.train_model import train_model, train_progressive
 
 
 @pytest.fixture
@@ -33,3 +35,108 @@ def test_train_model(mock_log_metric, mock_log_param, mock_log_model, mock_start
     mock_log_model.assert_called_once()
     assert mock_log_param.call_count > 0
     assert mock_log_metric.call_count > 0
+
+
+@pytest.fixture
+def engineered_df():
+    n = 2000
+    return pd.DataFrame({
+        'job_title': [f'Engineer {i}' for i in range(n)],
+        'industry': ['tech' if i % 3 else 'finance' for i in range(n)],
+        'job_level': ['Senior' if i % 2 else 'Mid-level' for i in range(n)],
+        'posting_month': [i % 12 + 1 for i in range(n)],
+        'skill_count': [i % 7 for i in range(n)],
+        'salary_value': [float(i) for i in range(n)],
+    })
+
+
+@pytest.fixture
+def progressive_mocks(engineered_df):
+    sampled = stratified_sample_batches([engineered_df], 0.1, stratum_sizes(count_strata([engineered_df])))
+    with patch('mlflow.set_tracking_uri'), patch('mlflow.set_experiment'), \
+            patch('mlflow.start_run') as mock_start_run, \
+            patch('mlflow.sklearn.log_model') as mock_log_model, \
+            patch('mlflow.log_param') as mock_log_param, \
+            patch('mlflow.log_metric') as mock_log_metric, \
+            patch('mlflow.set_tag') as mock_set_tag, \
+            patch('src.models.train_model.load_sampled_data', return_value=sampled) as mock_load_sampled, \
+            patch('src.models.train_model.prepare_data',
+                  return_value=select_features(engineered_df)) as mock_prepare, \
+            patch('src.models.train_model._fit_and_evaluate') as mock_fit:
+        mock_start_run.return_value.__enter__.return_value.info.run_id = 'mock_run_id'
+        yield {
+            'start_run': mock_start_run,
+            'log_model': mock_log_model,
+            'log_param': mock_log_param,
+            'log_metric': mock_log_metric,
+            'set_tag': mock_set_tag,
+            'load_sampled_data': mock_load_sampled,
+            'prepare_data': mock_prepare,
+            'fit': mock_fit,
+        }
+
+
+def test_train_progressive_streams_once(progressive_mocks, engineered_df):
+    progressive_mocks['fit'].side_effect = lambda X, y: (MagicMock(), 1.0, len(X) / len(engineered_df),
+                                                         int(len(X) * 0.8))
+
+    run_id = train_progressive({'mlflow_tracking_uri': 'mock_uri'})
+
+    assert run_id == 'mock_run_id'
+    progressive_mocks['load_sampled_data'].assert_called_once_with({'mlflow_tracking_uri': 'mock_uri'}, 0.1)
+    progressive_mocks['prepare_data'].assert_called_once()
+    fitted = [args[0] for args, _ in progressive_mocks['fit'].call_args_list]
+    assert len(fitted) == 3
+    assert len(fitted[0]) < len(fitted[1]) < len(fitted[2]) == len(engineered_df)
+    assert set(fitted[0]['job_title']) <= set(fitted[1]['job_title'])
+
+
+def test_train_progressive_stops_when_r2_plateaus(progressive_mocks):
+    progressive_mocks['fit'].side_effect = [(MagicMock(), 10.0, 0.5, 16), (MagicMock(), 9.0, 0.501, 160)]
+
+    train_progressive({'mlflow_tracking_uri': 'mock_uri'}, min_improvement=0.01)
+
+    assert progressive_mocks['fit'].call_count == 2
+    assert progressive_mocks['log_model'].call_count == 2
+    progressive_mocks['prepare_data'].assert_not_called()
+    progressive_mocks['log_metric'].assert_any_call("r2", 0.501, step=160)
+
+
+def test_train_progressive_skips_samples_that_did_not_grow(progressive_mocks):
+    progressive_mocks['fit'].return_value = (MagicMock(), 10.0, 0.5, 160)
+
+    train_progressive({'mlflow_tracking_uri': 'mock_uri'}, fractions=(0.1, 0.1), min_improvement=0.01)
+
+    assert progressive_mocks['fit'].call_count == 1
+    assert progressive_mocks['log_metric'].call_args_list.count((("r2", 0.5), {'step': 160})) == 1
+
+
+def test_train_progressive_skips_tiny_samples(progressive_mocks):
+    sampled = progressive_mocks['load_sampled_data'].return_value
+    progressive_mocks['load_sampled_data'].return_value = sampled.head(5)
+    progressive_mocks['fit'].return_value = (MagicMock(), 10.0, 0.5, 1600)
+
+    run_id = train_progressive({'mlflow_tracking_uri': 'mock_uri'})
+
+    assert run_id == 'mock_run_id'
+    assert progressive_mocks['fit'].call_count == 1
+    progressive_mocks['set_tag'].assert_any_call("skipped_fraction_0.01", "sample has fewer than 10 rows")
+
+
+def test_train_progressive_ignores_nan_r2_for_early_stopping(progressive_mocks):
+    progressive_mocks['fit'].side_effect = [(MagicMock(), 10.0, float('nan'), 16), (MagicMock(), 9.0, 0.5, 160),
+                                            (MagicMock(), 8.0, 0.9, 1600)]
+
+    train_progressive({'mlflow_tracking_uri': 'mock_uri'}, min_improvement=0.01)
+
+    assert progressive_mocks['fit'].call_count == 3
+    progressive_mocks['set_tag'].assert_not_called()
+
+
+@pytest.mark.parametrize('fractions', [(0.01, 1.5), (0, 0.1), ()])
+def test_train_progressive_rejects_invalid_fractions(progressive_mocks, fractions):
+    with pytest.raises(ValueError, match='Progressive fractions'):
+        train_progressive({'mlflow_tracking_uri': 'mock_uri'}, fractions=fractions)
+
+    progressive_mocks['load_sampled_data'].assert_not_called()
+    progressive_mocks['start_run'].assert_not_called()